@@ -6,7 +6,6 @@ Interface web principal para simulação e análise da estratégia de trading
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import time
 
 # Importar módulos locais
 from buscador_dados import buscar_dados_historicos, validar_simbolo
@@ -149,6 +148,37 @@ def validar_configuracoes(config: dict) -> tuple[bool, str]:
     return True, "Configurações válidas"
 
 
+@st.cache_data(max_entries=256)
+def executar_simulacao_em_cache(
+    dados_historicos: pd.DataFrame,
+    quantidade_inicial: float,
+    percentual_desvalorizacao: float,
+    percentual_valorizacao: float
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Executa a simulação da estratégia reaproveitando resultados já calculados
+    
+    A simulação é pura: os mesmos dados históricos e parâmetros sempre produzem as
+    mesmas operações, então reexecuções do script (ex: ao voltar a parâmetros já
+    testados) são respondidas pelo cache do Streamlit.
+    
+    Parâmetros:
+        dados_historicos: DataFrame com dados OHLCV
+        quantidade_inicial: Quantidade inicial de tokens
+        percentual_desvalorizacao: Percentual para gatilho de venda (%)
+        percentual_valorizacao: Percentual para gatilho de compra (%)
+    
+    Retorno:
+        Tupla contendo DataFrame de operações e métricas finais
+    """
+    return executar_simulacao_estrategia(
+        dados_historicos,
+        quantidade_inicial,
+        percentual_desvalorizacao,
+        percentual_valorizacao
+    )
+
+
 def executar_simulacao_completa(config: dict):
     """
     Executa a simulação completa com feedback visual
@@ -172,7 +202,7 @@ def executar_simulacao_completa(config: dict):
         )
         
         # Validar dados obtidos
-        is_valid, msg = validar_dados_para_analise(dados_historicos, [])
+        is_valid, msg = validar_dados_para_analise(dados_historicos, pd.DataFrame())
         if not is_valid:
             st.error(f"❌ Erro nos dados históricos: {msg}")
             return
@@ -184,7 +214,7 @@ def executar_simulacao_completa(config: dict):
         status_container.info("🧮 Executando simulação da estratégia...")
         progress_bar.progress(60)
         
-        operacoes, metricas = executar_simulacao_estrategia(
+        operacoes, metricas = executar_simulacao_em_cache(
             dados_historicos,
             config['quantidade_inicial'],
             config['percentual_desvalorizacao'],
@@ -198,7 +228,6 @@ def executar_simulacao_completa(config: dict):
         status_container.info("📊 Processando resultados...")
         progress_bar.progress(100)
         
-        time.sleep(0.5)  # Pequena pausa para feedback visual
         status_container.success("🎉 Simulação concluída com sucesso!")
         
         # Exibir resultados
@@ -210,20 +239,20 @@ def executar_simulacao_completa(config: dict):
         st.info("💡 Dica: Tente reduzir o período de análise ou verificar sua conexão com a internet.")
 
 
-def exibir_resultados(dados_historicos: pd.DataFrame, operacoes: list, metricas: dict, config: dict):
+def exibir_resultados(dados_historicos: pd.DataFrame, operacoes: pd.DataFrame, metricas: dict, config: dict):
     """
     Exibe os resultados da simulação na interface
     
     Parâmetros:
         dados_historicos: DataFrame com dados históricos
-        operacoes: Lista de operações executadas
+        operacoes: DataFrame com operações executadas
         metricas: Métricas calculadas
         config: Configurações da simulação
     """
     st.markdown("---")
     st.header("📊 Resultados da Simulação")
     
-    if not operacoes:
+    if operacoes.empty:
         st.warning("⚠️ Nenhuma operação foi executada no período analisado. Tente ajustar os parâmetros da estratégia.")
         return
     
@@ -264,7 +293,7 @@ def exibir_resultados(dados_historicos: pd.DataFrame, operacoes: list, metricas:
     )
     
     # Botão para download das operações
-    if operacoes:
+    if not operacoes.empty:
         csv_data = exportar_operacoes_csv(operacoes)
         st.download_button(
             label="📥 Baixar Operações (CSV)",
@@ -2,11 +2,50 @@
 Módulo responsável por buscar e processar dados históricos da Binance
 """
 
+import asyncio
 import ccxt
+import ccxt.async_support as ccxt_async
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime
-import time
+from typing import Optional
+
+
+# Configuração comum às instâncias síncrona e assíncrona da Binance
+CONFIGURACAO_EXCHANGE = {
+    'sandbox': False,
+    'enableRateLimit': True,
+    'timeout': 30000,  # 30 segundos timeout
+    'rateLimit': 1200,  # Rate limit mais conservador
+}
+
+# Timeframe fixo de 4 horas e tamanho máximo de cada página da API
+TIMEFRAME = '4h'
+DURACAO_CANDLE_MS = 4 * 60 * 60 * 1000
+LIMITE_POR_REQUEST = 1000
+
+
+@st.cache_resource
+def _obter_exchange() -> ccxt.binance:
+    """
+    Cria uma única instância configurada da exchange Binance, reaproveitada entre execuções
+    
+    Retorno:
+        Instância ccxt da Binance
+    """
+    return ccxt.binance(dict(CONFIGURACAO_EXCHANGE))
+
+
+@st.cache_data(ttl=3600)
+def _obter_simbolos_disponiveis() -> frozenset:
+    """
+    Carrega os mercados da Binance e mantém em cache apenas os símbolos negociáveis
+    
+    Retorno:
+        Conjunto com os símbolos disponíveis na exchange
+    """
+    return frozenset(_obter_exchange().load_markets(reload=True))
 
 
 @st.cache_data(ttl=3600)
@@ -23,61 +62,31 @@ def buscar_dados_historicos(simbolo: str, data_inicio: datetime, data_fim: datet
         DataFrame com colunas: timestamp, open, high, low, close, volume
     """
     try:
-        # Configurar exchange da Binance
-        exchange = ccxt.binance({
-            'sandbox': False,
-            'enableRateLimit': True,
-            'timeout': 30000,  # 30 segundos timeout
-            'rateLimit': 1200,  # Rate limit mais conservador
-        })
-        
         # Converter datas para timestamp em milissegundos
         timestamp_inicio = int(data_inicio.timestamp() * 1000)
         timestamp_fim = int(data_fim.timestamp() * 1000)
         
-        # Buscar dados com timeframe de 4 horas
-        timeframe = '4h'
-        dados_completos = []
-        
-        # Implementar paginação para períodos longos
-        timestamp_atual = timestamp_inicio
-        limite_por_request = 1000
-        
-        while timestamp_atual < timestamp_fim:
-            try:
-                dados_batch = exchange.fetch_ohlcv(
-                    simbolo, 
-                    timeframe, 
-                    since=timestamp_atual,
-                    limit=limite_por_request
-                )
-                
-                if not dados_batch:
-                    break
-                
-                dados_completos.extend(dados_batch)
-                
-                # Atualizar timestamp para próximo batch
-                timestamp_atual = dados_batch[-1][0] + 1
-                
-                # Rate limiting
-                time.sleep(0.1)
-                
-            except ccxt.NetworkError as e:
-                st.warning(f"Tentando reconectar... Erro: {str(e)}")
-                time.sleep(2)  # Aguardar antes de tentar novamente
-                continue
-                
-            except ccxt.ExchangeError as e:
-                st.warning(f"Erro da exchange, tentando continuar: {str(e)}")
-                time.sleep(1)
-                continue
+        # Quantidade de candles no período é conhecida de antemão (candles de 4h têm passo fixo)
+        quantidade_candles = (timestamp_fim - timestamp_inicio) // DURACAO_CANDLE_MS
         
-        # Converter para DataFrame
-        df = processar_dados_ohlcv(dados_completos)
+        if quantidade_candles < LIMITE_POR_REQUEST:
+            # Período cabe em uma única página: uma chamada direta, sem paginação
+            dados_completos = _obter_exchange().fetch_ohlcv(
+                simbolo,
+                TIMEFRAME,
+                since=timestamp_inicio,
+                limit=LIMITE_POR_REQUEST
+            )
+        else:
+            # Paginação com início de cada página conhecido de antemão (fim inclusivo)
+            inicios_paginas = range(timestamp_inicio, timestamp_fim + 1, LIMITE_POR_REQUEST * DURACAO_CANDLE_MS)
+            
+            # Buscar todas as páginas concorrentemente
+            dados_completos = asyncio.run(_buscar_paginas_concorrentes(simbolo, inicios_paginas))
         
-        # Filtrar pelo período exato solicitado
-        df = df[(df['timestamp'] >= data_inicio) & (df['timestamp'] <= data_fim)]
+        # Converter para DataFrame, descartando candles após o fim do período solicitado
+        # (o início já é garantido pelo since da primeira página)
+        df = processar_dados_ohlcv(dados_completos, timestamp_fim)
         
         return df
         
@@ -86,12 +95,58 @@ def buscar_dados_historicos(simbolo: str, data_inicio: datetime, data_fim: datet
         return pd.DataFrame()
 
 
-def processar_dados_ohlcv(dados_brutos: list) -> pd.DataFrame:
+async def _buscar_paginas_concorrentes(simbolo: str, inicios_paginas: range) -> list:
+    """
+    Busca páginas de OHLCV em paralelo, sobrepondo a latência de rede das requisições
+    
+    Parâmetros:
+        simbolo: Par de trading (ex: 'BTC/USDT')
+        inicios_paginas: Timestamps (ms) de início de cada página
+    
+    Retorno:
+        Lista de listas com dados OHLCV, na ordem das páginas
+    """
+    # O rate limiter interno da ccxt continua espaçando as requisições
+    exchange = ccxt_async.binance(dict(CONFIGURACAO_EXCHANGE))
+    
+    # Reaproveitar os mercados já carregados pela instância síncrona em cache: sem isso,
+    # o fetch_ohlcv da instância nova recarrega todos os mercados da Binance (spot, swap,
+    # futuros e opções) antes da primeira página
+    exchange.set_markets(_obter_exchange().load_markets())
+    
+    async def buscar_pagina(since: int) -> list:
+        while True:
+            try:
+                return await exchange.fetch_ohlcv(
+                    simbolo,
+                    TIMEFRAME,
+                    since=since,
+                    limit=LIMITE_POR_REQUEST
+                )
+            
+            except ccxt.NetworkError as e:
+                st.warning(f"Tentando reconectar... Erro: {str(e)}")
+                await asyncio.sleep(2)  # Aguardar antes de tentar novamente
+            
+            except ccxt.ExchangeError as e:
+                st.warning(f"Erro da exchange, tentando continuar: {str(e)}")
+                await asyncio.sleep(1)
+    
+    try:
+        paginas = await asyncio.gather(*(buscar_pagina(since) for since in inicios_paginas))
+    finally:
+        await exchange.close()
+    
+    return [candle for pagina in paginas for candle in pagina]
+
+
+def processar_dados_ohlcv(dados_brutos: list, timestamp_fim: Optional[int] = None) -> pd.DataFrame:
     """
     Processa dados OHLCV brutos da API em DataFrame formatado
     
     Parâmetros:
         dados_brutos: Lista de listas com dados OHLCV da API
+        timestamp_fim: Timestamp máximo (ms, inclusivo) a manter; None mantém todos
     
     Retorno:
         DataFrame formatado com colunas nomeadas
@@ -99,24 +154,35 @@ def processar_dados_ohlcv(dados_brutos: list) -> pd.DataFrame:
     if not dados_brutos:
         return pd.DataFrame()
     
-    # Criar DataFrame com colunas nomeadas
-    df = pd.DataFrame(dados_brutos, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    
-    # Converter timestamp para datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    # Converter todas as linhas [ts, o, h, l, c, v] em uma única matriz float64
+    # (timestamps em ms cabem com exatidão na mantissa de um float64)
+    dados = np.asarray(dados_brutos, dtype=np.float64)
     
-    # Converter preços para float
-    colunas_precos = ['open', 'high', 'low', 'close']
-    for coluna in colunas_precos:
-        df[coluna] = df[coluna].astype(float)
+    # Garantir ordem por timestamp (a API já retorna ordenado; só reordena se necessário)
+    timestamps = dados[:, 0]
+    if (timestamps[1:] < timestamps[:-1]).any():
+        dados = dados[np.argsort(timestamps, kind='stable')]
+        timestamps = dados[:, 0]
     
-    df['volume'] = df['volume'].astype(float)
+    # Remover duplicatas (só ocorrem em fronteiras de páginas) comparando vizinhos
+    manter = np.empty(len(timestamps), dtype=bool)
+    manter[0] = True
+    np.greater(timestamps[1:], timestamps[:-1], out=manter[1:])
+    dados = dados[manter]
     
-    # Ordenar por timestamp e remover duplicatas
-    df = df.sort_values('timestamp').drop_duplicates(subset=['timestamp'])
+    # Cortar o excesso da última página com busca binária sobre os timestamps ordenados
+    if timestamp_fim is not None:
+        dados = dados[:np.searchsorted(dados[:, 0], timestamp_fim, side='right')]
     
-    # Resetar índice
-    df = df.reset_index(drop=True)
+    # Criar DataFrame a partir das colunas da matriz
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(dados[:, 0].astype(np.int64), unit='ms'),
+        'open': dados[:, 1],
+        'high': dados[:, 2],
+        'low': dados[:, 3],
+        'close': dados[:, 4],
+        'volume': dados[:, 5]
+    })
     
     return df
 
@@ -132,9 +198,7 @@ def validar_simbolo(simbolo: str) -> bool:
         True se símbolo válido, False caso contrário
     """
     try:
-        exchange = ccxt.binance()
-        mercados = exchange.load_markets()
-        return simbolo in mercados
+        return simbolo in _obter_simbolos_disponiveis()
     except:
         return False
 
@@ -150,8 +214,7 @@ def obter_preco_atual(simbolo: str) -> float:
         Preço atual como float
     """
     try:
-        exchange = ccxt.binance()
-        ticker = exchange.fetch_ticker(simbolo)
+        ticker = _obter_exchange().fetch_ticker(simbolo)
         return float(ticker['last'])
     except:
         return 0.0
\ No newline at end of file
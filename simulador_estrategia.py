@@ -2,225 +2,486 @@
 Módulo contendo a lógica core da estratégia de recolocação de posição
 """
 
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from datetime import datetime
+from numba import njit, prange, types
+from typing import Dict, Any, Protocol
+
+
+# Códigos numéricos de estado e de tipo de operação usados no núcleo compilado
+# (o Numba não trabalha com strings e dicionários em modo nopython)
+ESTADO_COMPRADO = 0
+ESTADO_VENDIDO = 1
+OPERACAO_VENDA = 0
+OPERACAO_COMPRA = 1
+
+# Rótulos exibidos de cada tipo de operação, na posição do respectivo código numérico
+ROTULOS_OPERACOES = ['VENDA', 'COMPRA']
+
+# Tamanho da janela deslizante (7 dias = 168 períodos de 4h)
+TAMANHO_JANELA = 42  # 7 dias * 6 períodos por dia (4h)
+
+# Otimizações de ponto flutuante do LLVM, exceto as que supõem ausência de NaN/infinito
+# (o núcleo não valida os preços recebidos, e comparações com NaN devem continuar
+# falsas, sem disparar gatilho, como no IEEE 754) e 'arcp', que permitiria trocar a
+# divisão por 100 dos fatores dos gatilhos pelo produto por 0.01 e deslocar os limiares
+OTIMIZACOES_PONTO_FLUTUANTE = {'nsz', 'contract', 'afn', 'reassoc'}
+
+# Assinaturas explícitas do núcleo: compila na importação do módulo (e, com cache=True,
+# reaproveita o binário salvo em disco), em vez de compilar na primeira simulação.
+# Há uma variante para colunas somente leitura (pandas com copy-on-write)
+_RETORNO_NUCLEO = types.Tuple((
+    types.int64[::1], types.int8[::1], types.float64[::1], types.float64[::1], types.float64[::1]
+))
+ASSINATURAS_NUCLEO_SIMULACAO = [
+    _RETORNO_NUCLEO(
+        types.Array(types.float64, 1, 'C', readonly=somente_leitura),
+        types.Array(types.float64, 1, 'C', readonly=somente_leitura),
+        types.float64, types.float64, types.float64, types.int64
+    )
+    for somente_leitura in (False, True)
+]
+
+
+class DadosOHLCV(Protocol):
+    """
+    Interface mínima exigida dos dados históricos pela simulação: tamanho e acesso às
+    colunas por nome, com cada coluna convertível por to_numpy(). Atendida por
+    DataFrames do pandas e do Polars, sem conversão entre bibliotecas
+    """
+    
+    def __len__(self) -> int: ...
+    
+    def __getitem__(self, coluna: str) -> Any: ...
+
+
+# Colunas do DataFrame de operações retornado pela simulação
+COLUNAS_OPERACOES = [
+    'timestamp',
+    'tipo',
+    'preco',
+    'quantidade_tokens',
+    'total_tokens_apos_operacao',
+    'valor_usd_posicao',
+    'lucro_operacao',
+    'lucro_percentual'
+]
+
+# Faixa aceita para os percentuais de venda e compra (%)
+PERCENTUAL_MINIMO = 1.0
+PERCENTUAL_MAXIMO = 20.0
+
+# Resultados fixos da validação de parâmetros (reaproveitados a cada chamada)
+_PARAMETROS_VALIDOS = (True, "Parâmetros válidos")
+_FALHA_DESVALORIZACAO = (False, "Percentual de desvalorização deve estar entre 1% e 20%")
+_FALHA_VALORIZACAO = (False, "Percentual de valorização deve estar entre 1% e 20%")
+_FALHA_QUANTIDADE = (False, "Quantidade inicial deve ser maior que zero")
 
 
 def executar_simulacao_estrategia(
-    dados_historicos: pd.DataFrame,
+    dados_historicos: DadosOHLCV,
     quantidade_inicial: float,
     percentual_desvalorizacao: float,
     percentual_valorizacao: float
-) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+) -> tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Executa a simulação completa da estratégia de recolocação de posição
     
     Parâmetros:
-        dados_historicos: DataFrame com dados OHLCV
+        dados_historicos: DataFrame (pandas ou Polars) com dados OHLCV
         quantidade_inicial: Quantidade inicial de tokens
         percentual_desvalorizacao: Percentual para gatilho de venda (%)
         percentual_valorizacao: Percentual para gatilho de compra (%)
     
     Retorno:
-        Tupla contendo lista de operações e métricas finais
+        Tupla contendo DataFrame de operações (uma linha por operação) e métricas finais
+    """
+    if len(dados_historicos) == 0:
+        return pd.DataFrame(columns=COLUNAS_OPERACOES), {}
+    
+    # Extrair colunas uma única vez como arrays NumPy contíguos (exigidos pela assinatura do núcleo)
+    precos_fechamento, precos_maximos = _extrair_precos(dados_historicos)
+    # Timestamps ficam fora do núcleo (que trabalha só com índices de período); são
+    # normalizados uma única vez para datetime64[ns], qualquer que seja a resolução de origem
+    timestamps = np.asarray(dados_historicos['timestamp'].to_numpy(), dtype='datetime64[ns]')
+    
+    # Executar a máquina de estados no núcleo compilado
+    indices, tipos, precos, quantidades, valores_usd = _nucleo_simulacao(
+        precos_fechamento,
+        precos_maximos,
+        float(quantidade_inicial),
+        float(percentual_desvalorizacao),
+        float(percentual_valorizacao),
+        TAMANHO_JANELA
+    )
+    
+    # Materializar operações em formato colunar uma única vez
+    df_operacoes = montar_operacoes(
+        timestamps[indices],
+        tipos,
+        precos,
+        quantidades,
+        valores_usd,
+        quantidade_inicial
+    )
+    
+    # Calcular métricas finais
+    metricas = calcular_metricas_performance(df_operacoes, quantidade_inicial)
+    
+    return df_operacoes, metricas
+
+
+def simular_grade(
+    dados_historicos: DadosOHLCV,
+    quantidade_inicial: float,
+    percentuais_desvalorizacao: np.ndarray,
+    percentuais_valorizacao: np.ndarray
+) -> np.ndarray:
+    """
+    Simula a estratégia para cada combinação de percentuais de venda e compra, em paralelo
+    
+    Parâmetros:
+        dados_historicos: DataFrame (pandas ou Polars) com dados OHLCV
+        quantidade_inicial: Quantidade inicial de tokens
+        percentuais_desvalorizacao: Percentuais para gatilho de venda a testar (%)
+        percentuais_valorizacao: Percentuais para gatilho de compra a testar (%)
+    
+    Retorno:
+        Matriz com o lucro percentual total de cada combinação, indexada por
+        (índice do percentual de desvalorização, índice do percentual de valorização)
     """
-    if dados_historicos.empty:
-        return [], {}
+    percentuais_desvalorizacao = np.asarray(percentuais_desvalorizacao, dtype=np.float64)
+    percentuais_valorizacao = np.asarray(percentuais_valorizacao, dtype=np.float64)
+    
+    if len(dados_historicos) == 0:
+        return np.zeros((len(percentuais_desvalorizacao), len(percentuais_valorizacao)))
+    
+    precos_fechamento, precos_maximos = _extrair_precos(dados_historicos)
+    
+    return _nucleo_grade(
+        precos_fechamento,
+        precos_maximos,
+        float(quantidade_inicial),
+        percentuais_desvalorizacao,
+        percentuais_valorizacao,
+        TAMANHO_JANELA
+    )
+
+
+def _extrair_precos(dados_historicos: DadosOHLCV) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Extrai os preços de fechamento e máximos como arrays float64 contíguos
+    
+    Parâmetros:
+        dados_historicos: DataFrame (pandas ou Polars) com dados OHLCV
+    
+    Retorno:
+        Tupla com preços de fechamento e preços máximos
+    """
+    return (
+        # to_numpy() sem argumentos, comum às bibliotecas; o dtype é fixado aqui
+        np.ascontiguousarray(dados_historicos['close'].to_numpy(), dtype=np.float64),
+        np.ascontiguousarray(dados_historicos['high'].to_numpy(), dtype=np.float64)
+    )
+
+
+@njit(ASSINATURAS_NUCLEO_SIMULACAO, cache=True, fastmath=OTIMIZACOES_PONTO_FLUTUANTE)
+def _nucleo_simulacao(
+    precos_fechamento: np.ndarray,
+    precos_maximos: np.ndarray,
+    quantidade_inicial: float,
+    percentual_desvalorizacao: float,
+    percentual_valorizacao: float,
+    tamanho_janela: int
+) -> tuple:
+    """
+    Executa a máquina de estados da estratégia período a período, compilada com Numba
+    
+    Parâmetros:
+        precos_fechamento: Preços de fechamento de cada período
+        precos_maximos: Preços máximos de cada período
+        quantidade_inicial: Quantidade inicial de tokens
+        percentual_desvalorizacao: Percentual para gatilho de venda (%)
+        percentual_valorizacao: Percentual para gatilho de compra (%)
+        tamanho_janela: Quantidade de períodos da janela deslizante de preço máximo
+    
+    Retorno:
+        Tupla de arrays paralelos com índice do período, tipo, preço, quantidade
+        de tokens e valor em USD de cada operação
+    """
+    quantidade_periodos = precos_fechamento.shape[0]
+    
+    # Pré-alocar saídas com o limite superior de uma operação por período
+    indices = np.empty(quantidade_periodos, dtype=np.int64)
+    tipos = np.empty(quantidade_periodos, dtype=np.int8)
+    precos = np.empty(quantidade_periodos, dtype=np.float64)
+    quantidades = np.empty(quantidade_periodos, dtype=np.float64)
+    valores_usd = np.empty(quantidade_periodos, dtype=np.float64)
+    total_operacoes = 0
+    
+    # Deque monotônica com índices candidatos a máximo da janela deslizante, em ordem
+    # decrescente de preço máximo; o início da deque é sempre o máximo da janela.
+    # Alocada com um espaço por período para que os ponteiros nunca precisem dar a volta
+    deque_janela = np.empty(quantidade_periodos, dtype=np.int64)
+    inicio_deque = 0
+    fim_deque = 0
     
     # Inicializar variáveis da estratégia
-    estado_atual = "COMPRADO"
-    operacoes = []
+    estado_atual = ESTADO_COMPRADO
     quantidade_tokens_atual = quantidade_inicial
+    valor_usd_ultima_venda = 0.0
+    # Sem sentinela infinito: o mínimo só é lido no estado VENDIDO,
+    # e toda venda o redefine com o próprio preço de venda
+    preco_minimo_apos_venda = 0.0
     
-    # Variáveis de controle para cálculos
-    preco_minimo_apos_venda = float('inf')
-    indice_venda = -1
-    
-    # Tamanho da janela deslizante (7 dias = 168 períodos de 4h)
-    tamanho_janela = 42  # 7 dias * 6 períodos por dia (4h)
+    # Fatores dos gatilhos são constantes da simulação: calculados uma única vez, fora do laço
+    # (divisão por 100, e não produto por 0.01, para que os limiares sejam exatos; por isso
+    # 'arcp' fica fora de OTIMIZACOES_PONTO_FLUTUANTE, já que faria essa mesma troca)
+    fator_venda = 1 - percentual_desvalorizacao / 100
+    fator_compra = 1 + percentual_valorizacao / 100
     
     # Processar cada período
-    for i in range(len(dados_historicos)):
-        periodo_atual = dados_historicos.iloc[i]
-        preco_atual = periodo_atual['close']
-        timestamp_atual = periodo_atual['timestamp']
+    for i in range(quantidade_periodos):
+        preco_atual = precos_fechamento[i]
         
-        if estado_atual == "COMPRADO":
-            # Calcular janela deslizante para preço máximo
-            inicio_janela = max(0, i - tamanho_janela + 1)
-            janela_dados = dados_historicos.iloc[inicio_janela:i+1]
-            preco_maximo_janela = janela_dados['high'].max()
-            
-            # Calcular preço de gatilho para venda
-            preco_venda = preco_maximo_janela * (1 - percentual_desvalorizacao / 100)
-            
-            # Verificar condição de venda
-            if preco_atual <= preco_venda:
-                # Executar venda
-                operacao_venda = executar_operacao_venda(
-                    timestamp_atual,
-                    preco_atual,
-                    quantidade_tokens_atual
-                )
-                operacoes.append(operacao_venda)
+        # Atualizar a deque em todos os períodos, para que continue válida entre estados:
+        # descartar índices que saíram da janela e os que nunca mais serão máximo
+        while inicio_deque < fim_deque and deque_janela[inicio_deque] <= i - tamanho_janela:
+            inicio_deque += 1
+        preco_maximo_periodo = precos_maximos[i]
+        if preco_maximo_periodo == preco_maximo_periodo:
+            # Máximo NaN nunca entra na deque (ignorado, como no max() do pandas)
+            while (fim_deque > inicio_deque
+                   and precos_maximos[deque_janela[fim_deque - 1]] <= preco_maximo_periodo):
+                fim_deque -= 1
+            deque_janela[fim_deque] = i
+            fim_deque += 1
+        
+        # Preço máximo da janela deslizante em O(1) amortizado
+        # (NaN se todos os máximos da janela forem NaN, e então a venda não dispara)
+        if inicio_deque < fim_deque:
+            preco_maximo_janela = precos_maximos[deque_janela[inicio_deque]]
+        else:
+            preco_maximo_janela = np.nan
+        
+        # Atualizar preço mínimo em todos os períodos (é redefinido na venda,
+        # então no estado VENDIDO reflete apenas o mínimo desde a venda;
+        # no estado COMPRADO o valor é ignorado)
+        preco_minimo_apos_venda = min(preco_minimo_apos_venda, preco_atual)
+        
+        # Avaliar os dois gatilhos como booleanos, sem desvios dependentes dos preços;
+        # o estado atual garante que no máximo um deles dispara
+        vendido = estado_atual == ESTADO_VENDIDO
+        gatilho_venda = (not vendido) & (preco_atual <= preco_maximo_janela * fator_venda)
+        gatilho_compra = vendido & (preco_atual >= preco_minimo_apos_venda * fator_compra)
+        
+        # Caminho comum (nenhuma operação no período) testa um único booleano
+        if gatilho_venda | gatilho_compra:
+            if gatilho_venda:
+                # Registrar venda de todos os tokens
+                indices[total_operacoes] = i
+                tipos[total_operacoes] = OPERACAO_VENDA
+                precos[total_operacoes] = preco_atual
+                quantidades[total_operacoes] = quantidade_tokens_atual
+                valor_usd_ultima_venda = quantidade_tokens_atual * preco_atual
+                valores_usd[total_operacoes] = valor_usd_ultima_venda
+                total_operacoes += 1
                 
                 # Atualizar estado
-                estado_atual = "VENDIDO"
+                estado_atual = ESTADO_VENDIDO
                 preco_minimo_apos_venda = preco_atual
-                indice_venda = i
-        
-        elif estado_atual == "VENDIDO":
-            # Atualizar preço mínimo desde a venda
-            preco_minimo_apos_venda = min(preco_minimo_apos_venda, preco_atual)
-            
-            # Calcular preço de gatilho para compra
-            preco_compra = preco_minimo_apos_venda * (1 + percentual_valorizacao / 100)
             
-            # Verificar condição de compra
-            if preco_atual >= preco_compra:
-                # Calcular nova quantidade de tokens
-                valor_usd_disponivel = operacoes[-1]['valor_usd_posicao']
-                nova_quantidade_tokens = valor_usd_disponivel / preco_atual
+            else:
+                # Calcular nova quantidade de tokens com o valor em USD da última venda
+                nova_quantidade_tokens = valor_usd_ultima_venda / preco_atual
                 
-                # Executar compra
-                operacao_compra = executar_operacao_compra(
-                    timestamp_atual,
-                    preco_atual,
-                    nova_quantidade_tokens,
-                    quantidade_tokens_atual
-                )
-                operacoes.append(operacao_compra)
+                # Registrar compra
+                indices[total_operacoes] = i
+                tipos[total_operacoes] = OPERACAO_COMPRA
+                precos[total_operacoes] = preco_atual
+                quantidades[total_operacoes] = nova_quantidade_tokens
+                valores_usd[total_operacoes] = nova_quantidade_tokens * preco_atual
+                total_operacoes += 1
                 
                 # Atualizar estado
-                estado_atual = "COMPRADO"
+                estado_atual = ESTADO_COMPRADO
                 quantidade_tokens_atual = nova_quantidade_tokens
-                preco_minimo_apos_venda = float('inf')
     
-    # Calcular métricas finais
-    metricas = calcular_metricas_performance(operacoes, quantidade_inicial)
-    
-    return operacoes, metricas
+    return (
+        indices[:total_operacoes],
+        tipos[:total_operacoes],
+        precos[:total_operacoes],
+        quantidades[:total_operacoes],
+        valores_usd[:total_operacoes]
+    )
 
 
-def executar_operacao_venda(
-    timestamp: datetime,
-    preco: float,
-    quantidade_tokens: float
-) -> Dict[str, Any]:
+@njit(parallel=True, cache=True)
+def _nucleo_grade(
+    precos_fechamento: np.ndarray,
+    precos_maximos: np.ndarray,
+    quantidade_inicial: float,
+    percentuais_desvalorizacao: np.ndarray,
+    percentuais_valorizacao: np.ndarray,
+    tamanho_janela: int
+) -> np.ndarray:
     """
-    Executa uma operação de venda e registra os detalhes
+    Executa o núcleo da simulação para cada combinação de parâmetros, distribuindo
+    as combinações entre threads com prange
     
     Parâmetros:
-        timestamp: Momento da operação
-        preco: Preço de venda
-        quantidade_tokens: Quantidade de tokens vendidos
+        precos_fechamento: Preços de fechamento de cada período
+        precos_maximos: Preços máximos de cada período
+        quantidade_inicial: Quantidade inicial de tokens
+        percentuais_desvalorizacao: Percentuais para gatilho de venda (%)
+        percentuais_valorizacao: Percentuais para gatilho de compra (%)
+        tamanho_janela: Quantidade de períodos da janela deslizante de preço máximo
     
     Retorno:
-        Dicionário com detalhes da operação
+        Matriz com o lucro percentual total de cada combinação
     """
-    valor_usd_total = quantidade_tokens * preco
+    quantidade_desvalorizacao = percentuais_desvalorizacao.shape[0]
+    quantidade_valorizacao = percentuais_valorizacao.shape[0]
+    lucros_percentuais = np.zeros((quantidade_desvalorizacao, quantidade_valorizacao))
     
-    return {
-        'timestamp': timestamp,
-        'tipo': 'VENDA',
-        'preco': preco,
-        'quantidade_tokens': quantidade_tokens,
-        'total_tokens_apos_operacao': 0.0,  # Vendeu tudo
-        'valor_usd_posicao': valor_usd_total,
-        'lucro_operacao': 0.0,  # Será calculado na próxima compra
-        'lucro_percentual': 0.0
-    }
+    # Cada combinação é independente: uma iteração do prange por par de percentuais
+    for combinacao in prange(quantidade_desvalorizacao * quantidade_valorizacao):
+        i = combinacao // quantidade_valorizacao
+        j = combinacao % quantidade_valorizacao
+        
+        _, tipos, _, quantidades, _ = _nucleo_simulacao(
+            precos_fechamento,
+            precos_maximos,
+            quantidade_inicial,
+            percentuais_desvalorizacao[i],
+            percentuais_valorizacao[j],
+            tamanho_janela
+        )
+        
+        # Quantidade final de tokens: a da última compra (mesma regra de calcular_metricas_performance)
+        tokens_final = quantidade_inicial
+        for k in range(tipos.shape[0] - 1, -1, -1):
+            if tipos[k] == OPERACAO_COMPRA:
+                tokens_final = quantidades[k]
+                break
+        
+        if quantidade_inicial > 0:
+            lucros_percentuais[i, j] = (tokens_final - quantidade_inicial) / quantidade_inicial * 100
+    
+    return lucros_percentuais
 
 
-def executar_operacao_compra(
-    timestamp: datetime,
-    preco: float,
-    quantidade_tokens: float,
-    quantidade_tokens_anterior: float
-) -> Dict[str, Any]:
+def montar_operacoes(
+    timestamps: np.ndarray,
+    tipos: np.ndarray,
+    precos: np.ndarray,
+    quantidades: np.ndarray,
+    valores_usd: np.ndarray,
+    quantidade_inicial: float
+) -> pd.DataFrame:
     """
-    Executa uma operação de compra e registra os detalhes
+    Monta o DataFrame de operações a partir dos arrays paralelos do núcleo da simulação
     
     Parâmetros:
-        timestamp: Momento da operação
-        preco: Preço de compra
-        quantidade_tokens: Quantidade de tokens comprados
-        quantidade_tokens_anterior: Quantidade anterior para cálculo de lucro
+        timestamps: Momento de cada operação
+        tipos: Código do tipo de cada operação (OPERACAO_VENDA ou OPERACAO_COMPRA)
+        precos: Preço de cada operação
+        quantidades: Quantidade de tokens vendidos ou comprados
+        valores_usd: Valor em USD da posição após cada operação
+        quantidade_inicial: Quantidade inicial de tokens
     
     Retorno:
-        Dicionário com detalhes da operação
+        DataFrame com uma linha por operação e as colunas de COLUNAS_OPERACOES
     """
-    valor_usd_total = quantidade_tokens * preco
-    lucro_tokens = quantidade_tokens - quantidade_tokens_anterior
-    lucro_percentual = (lucro_tokens / quantidade_tokens_anterior) * 100 if quantidade_tokens_anterior > 0 else 0
+    eh_compra = tipos == OPERACAO_COMPRA
     
-    return {
-        'timestamp': timestamp,
-        'tipo': 'COMPRA',
-        'preco': preco,
-        'quantidade_tokens': quantidade_tokens,
-        'total_tokens_apos_operacao': quantidade_tokens,
-        'valor_usd_posicao': valor_usd_total,
+    # Toda compra sucede uma venda, que guarda a quantidade anterior de tokens
+    quantidades_anteriores = np.concatenate(([quantidade_inicial], quantidades[:-1]))
+    
+    # Lucro só existe nas compras (nas vendas é calculado na compra seguinte)
+    lucro_tokens = np.where(eh_compra, quantidades - quantidades_anteriores, 0.0)
+    lucro_percentual = np.zeros(len(tipos))
+    np.divide(
+        lucro_tokens,
+        quantidades_anteriores,
+        out=lucro_percentual,
+        where=eh_compra & (quantidades_anteriores > 0)
+    )
+    lucro_percentual *= 100
+    
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        # Categórico sobre os próprios códigos do núcleo: um byte por operação, sem strings
+        'tipo': pd.Categorical.from_codes(tipos, categories=ROTULOS_OPERACOES),
+        'preco': precos,
+        'quantidade_tokens': quantidades,
+        'total_tokens_apos_operacao': np.where(eh_compra, quantidades, 0.0),  # Venda vende tudo
+        'valor_usd_posicao': valores_usd,
         'lucro_operacao': lucro_tokens,
         'lucro_percentual': lucro_percentual
-    }
+    }, columns=COLUNAS_OPERACOES)
 
 
 def calcular_metricas_performance(
-    operacoes: List[Dict[str, Any]], 
+    operacoes: pd.DataFrame, 
     quantidade_inicial: float
 ) -> Dict[str, Any]:
     """
     Calcula métricas consolidadas de performance da estratégia
     
     Parâmetros:
-        operacoes: Lista de todas as operações executadas
+        operacoes: DataFrame com todas as operações executadas
         quantidade_inicial: Quantidade inicial de tokens
     
     Retorno:
         Dicionário com métricas calculadas
     """
-    if not operacoes:
+    if operacoes.empty:
         return {
             'total_operacoes': 0,
+            'total_compras': 0,
             'operacoes_lucrativas': 0,
             'operacoes_prejuizo': 0,
+            'taxa_sucesso': 0.0,
             'tokens_inicial': quantidade_inicial,
             'tokens_final': quantidade_inicial,
             'lucro_total_tokens': 0.0,
             'lucro_percentual_total': 0.0
         }
     
-    # Filtrar apenas operações de compra para calcular lucros
-    compras = [op for op in operacoes if op['tipo'] == 'COMPRA']
+    # Uma única máscara de compras (comparação sobre os códigos do categórico),
+    # sem criar sub-DataFrames
+    mascara_compras = (operacoes['tipo'] == 'COMPRA').to_numpy()
+    lucros_compras = operacoes['lucro_operacao'].to_numpy()[mascara_compras]
     
     # Calcular estatísticas
     total_operacoes = len(operacoes)
-    operacoes_lucrativas = len([op for op in compras if op['lucro_operacao'] > 0])
-    operacoes_prejuizo = len([op for op in compras if op['lucro_operacao'] < 0])
-    
-    # Quantidade final de tokens
-    if operacoes:
-        ultima_operacao = operacoes[-1]
-        if ultima_operacao['tipo'] == 'COMPRA':
-            tokens_final = ultima_operacao['total_tokens_apos_operacao']
-        else:
-            # Se última operação foi venda, ainda tem o valor em USD
-            # Para simplificar, consideramos que ainda temos os tokens da penúltima compra
-            compras_executadas = [op for op in operacoes if op['tipo'] == 'COMPRA']
-            tokens_final = compras_executadas[-1]['total_tokens_apos_operacao'] if compras_executadas else quantidade_inicial
+    total_compras = len(lucros_compras)
+    operacoes_lucrativas = int(np.count_nonzero(lucros_compras > 0))
+    operacoes_prejuizo = int(np.count_nonzero(lucros_compras < 0))
+    
+    # Quantidade final de tokens: a da última compra
+    # (se a última operação foi venda, ainda tem o valor em USD; para simplificar,
+    # consideramos que ainda temos os tokens da penúltima compra)
+    if total_compras > 0:
+        ultima_compra = np.flatnonzero(mascara_compras)[-1]
+        tokens_final = operacoes['total_tokens_apos_operacao'].to_numpy()[ultima_compra]
     else:
         tokens_final = quantidade_inicial
     
+    # Taxa de sucesso: percentual das compras que aumentaram a quantidade de tokens
+    taxa_sucesso = (operacoes_lucrativas / total_compras * 100) if total_compras > 0 else 0.0
+    
     # Calcular lucro total
     lucro_total_tokens = tokens_final - quantidade_inicial
     lucro_percentual_total = (lucro_total_tokens / quantidade_inicial) * 100 if quantidade_inicial > 0 else 0
     
     return {
         'total_operacoes': total_operacoes,
+        'total_compras': total_compras,
         'operacoes_lucrativas': operacoes_lucrativas,
         'operacoes_prejuizo': operacoes_prejuizo,
+        'taxa_sucesso': taxa_sucesso,
         'tokens_inicial': quantidade_inicial,
         'tokens_final': tokens_final,
         'lucro_total_tokens': lucro_total_tokens,
@@ -244,13 +505,13 @@ def validar_parametros_estrategia(
     Retorno:
         Tupla com status de validação e mensagem de erro
     """
-    if not (1 <= percentual_desvalorizacao <= 20):
-        return False, "Percentual de desvalorização deve estar entre 1% e 20%"
+    if not (PERCENTUAL_MINIMO <= percentual_desvalorizacao <= PERCENTUAL_MAXIMO):
+        return _FALHA_DESVALORIZACAO
     
-    if not (1 <= percentual_valorizacao <= 20):
-        return False, "Percentual de valorização deve estar entre 1% e 20%"
+    if not (PERCENTUAL_MINIMO <= percentual_valorizacao <= PERCENTUAL_MAXIMO):
+        return _FALHA_VALORIZACAO
     
     if quantidade_inicial <= 0:
-        return False, "Quantidade inicial deve ser maior que zero"
+        return _FALHA_QUANTIDADE
     
-    return True, "Parâmetros válidos"
\ No newline at end of file
+    return _PARAMETROS_VALIDOS
\ No newline at end of file